@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Catalog file helpers shared by the ROM upload scripts.
+
+The JSON catalog lives next to the scripts; the TypeScript catalog it feeds
+is imported by the retro-arcade game at build time, so catalog changes show
+up on the site with the next web build/deploy.
+"""
+
+import json
+import os
+from pathlib import Path
+
+
+def write_file_atomic(path: Path, content: str):
+    """Write via a temp file + rename so readers never see a half-written file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def load_catalog(path: Path) -> list:
+    """Load a JSON catalog (empty if none has been written yet)."""
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_catalog(path: Path, catalog: list):
+    """Atomically write a JSON catalog, sorted by filename for stable diffs."""
+    write_file_atomic(path, json.dumps(sorted(catalog, key=lambda x: x["filename"]), indent=2))
+    print(f"Catalog saved to {path}")
+
+
+def upload_priority(entry: dict, size: int, genre_weights: dict) -> tuple:
+    """Sort key for upload order: favorites, then genre weight, then smallest first."""
+    genre_weight = genre_weights.get(entry["genre"], len(genre_weights))
+    return (not entry["favorite"], genre_weight, size, entry["filename"])
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Command-line flag handling shared by the ROM upload scripts.
+
+See the Usage section of each upload_*_roms.py script for the flags.
+"""
+
+import os
+import sys
+from typing import Callable, Optional
+
+
+def run(
+    upload_roms: Callable[..., object],
+    audit_roms: Callable[..., bool],
+    watch_roms: Callable[..., None],
+    generate_catalog_only: Optional[Callable[[], object]] = None,
+    argv: Optional[list] = None,
+):
+    """Dispatch the script's flags to the matching function."""
+    argv = sys.argv if argv is None else argv
+    script = os.path.basename(argv[0])
+
+    if generate_catalog_only is not None and "--catalog-only" in argv:
+        generate_catalog_only()
+    elif "--audit" in argv:
+        sys.exit(0 if audit_roms(fix="--fix" in argv) else 1)
+    elif "--watch" in argv:
+        watch_roms(use_polling="--poll" in argv)
+    else:
+        checkpoint_every = 50
+        if "--checkpoint" in argv:
+            try:
+                checkpoint_every = int(argv[argv.index("--checkpoint") + 1])
+            except (IndexError, ValueError):
+                checkpoint_every = -1
+            if checkpoint_every < 0:
+                sys.exit(
+                    f"Usage: python {script} --checkpoint N\n"
+                    "  N = new catalog games between interim catalogs (0 disables)"
+                )
+        upload_roms(checkpoint_every=checkpoint_every)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+S3 helpers shared by the ROM upload scripts.
+
+Uploads store the file's MD5 in object metadata so later audits can verify
+content even when the ETag is not a plain MD5 (multipart uploads). The same
+size and MD5 are recorded in the catalog, so an audit compares the catalog
+against the bucket without needing the original ROM files.
+"""
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+# Object metadata key holding the MD5 of the uploaded file
+MD5_METADATA_KEY = "md5"
+
+# Audit statuses that count as a failure (re-uploaded with --fix when the
+# local source is available). "unverified" = nothing to compare against,
+# "size-only" = size matches but the remote MD5 is unknown.
+FAILED_STATUSES = (
+    "missing", "size-mismatch", "checksum-mismatch", "size-only", "unverified", "error",
+)
+
+
+def create_s3_client(
+    endpoint: str, access_key: str, secret_key: str, max_pool_connections: int = 10
+):
+    """Create an S3 client (pool size bounds concurrent requests)."""
+    return boto3.client(
+        "s3",
+        endpoint_url=endpoint,
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
+        config=Config(
+            signature_version="s3v4",
+            max_pool_connections=max_pool_connections,
+        ),
+    )
+
+
+def file_md5(path: str) -> str:
+    """Hex MD5 of a local file."""
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def file_fingerprint(path: str) -> dict:
+    """Size and MD5 of a local file, as stored in catalog entries."""
+    return {"size": os.path.getsize(path), "md5": file_md5(path)}
+
+
+def upload_rom(s3, bucket: str, key: str, path: str, md5: Optional[str] = None):
+    """Upload a ROM as a public object, recording its MD5 in metadata."""
+    s3.upload_file(
+        path,
+        bucket,
+        key,
+        ExtraArgs={
+            "ContentType": "application/octet-stream",
+            "ACL": "public-read",
+            "Metadata": {MD5_METADATA_KEY: md5 or file_md5(path)},
+        }
+    )
+
+
+def _remote_md5(head: dict) -> Optional[str]:
+    """MD5 recorded for a remote object, or None if it can't be known."""
+    stored = head.get("Metadata", {}).get(MD5_METADATA_KEY)
+    if stored:
+        return stored
+
+    # Single-part uploads have the MD5 as ETag; multipart ETags contain a "-"
+    etag = head.get("ETag", "").strip('"')
+    if etag and "-" not in etag:
+        return etag
+    return None
+
+
+def check_object(
+    s3, bucket: str, key: str, size: Optional[int], md5: Optional[str]
+) -> dict:
+    """
+    Compare one remote object against its expected size and MD5.
+
+    Never raises - network errors come back as status "error" so one bad
+    object doesn't abort a whole audit.
+    """
+    result = {"key": key, "status": "ok", "detail": ""}
+
+    try:
+        head = s3.head_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        code = e.response.get("Error", {}).get("Code", "")
+        if code in ("404", "NoSuchKey", "NotFound"):
+            result["status"] = "missing"
+        else:
+            result["status"] = "error"
+            result["detail"] = str(e)
+        return result
+    except Exception as e:
+        # BotoCoreError (connection failures, read timeouts, ...) and friends
+        result["status"] = "error"
+        result["detail"] = str(e)
+        return result
+
+    if size is None or md5 is None:
+        result["status"] = "unverified"
+        result["detail"] = "no recorded size/md5 and no local source file"
+        return result
+
+    if head["ContentLength"] != size:
+        result["status"] = "size-mismatch"
+        result["detail"] = f"remote {head['ContentLength']} bytes, expected {size} bytes"
+        return result
+
+    remote_md5 = _remote_md5(head)
+    if remote_md5 is None:
+        result["status"] = "size-only"
+        result["detail"] = "multipart ETag and no md5 metadata"
+    elif remote_md5 != md5:
+        result["status"] = "checksum-mismatch"
+        result["detail"] = f"remote {remote_md5}, expected {md5}"
+    return result
+
+
+def _expected_fingerprint(game: dict, local_path: Optional[str]) -> tuple:
+    """(size, md5) recorded in the catalog, falling back to the local file."""
+    if game.get("size") is not None and game.get("md5"):
+        return game["size"], game["md5"]
+    if local_path:
+        fingerprint = file_fingerprint(local_path)
+        return fingerprint["size"], fingerprint["md5"]
+    return None, None
+
+
+def audit_objects(
+    s3,
+    bucket: str,
+    prefix: str,
+    catalog: list,
+    local_files: dict,
+    max_workers: int = 32,
+    reupload: Optional[Callable[[str, str], None]] = None,
+) -> list:
+    """
+    Check every catalog entry against the bucket concurrently.
+
+    Each object is compared with the size/MD5 recorded in its catalog entry;
+    entries from older catalogs without them fall back to the local file.
+    local_files maps catalog filename -> local source path and is only
+    needed for that fallback and for re-uploads. The S3 client should allow
+    at least max_workers pooled connections. If reupload is given, it is
+    called as reupload(local_path, key) for each failed entry that has a
+    local source, and the entry is re-checked afterwards.
+    """
+    def audit_one(game: dict) -> dict:
+        key = f"{prefix}/{game['filename']}"
+        local_path = local_files.get(game["filename"])
+        try:
+            size, md5 = _expected_fingerprint(game, local_path)
+        except OSError as e:
+            return {"key": key, "status": "error", "detail": f"cannot read local file: {e}"}
+        result = check_object(s3, bucket, key, size, md5)
+
+        if reupload and local_path and result["status"] in FAILED_STATUSES:
+            print(f"  [FIX] {key} ({result['status']})")
+            try:
+                reupload(local_path, key)
+            except Exception as e:
+                result["detail"] = f"re-upload failed: {e}"
+                return result
+            result = check_object(s3, bucket, key, size, md5)
+            result["fixed"] = result["status"] == "ok"
+
+        return result
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(audit_one, catalog))
+
+
+def print_audit_report(results: list) -> bool:
+    """Print a pass/fail summary of audit results. Returns True if all passed."""
+    counts = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+
+    failures = [r for r in results if r["status"] in FAILED_STATUSES]
+    for result in sorted(failures, key=lambda r: r["key"]):
+        detail = f" - {result['detail']}" if result["detail"] else ""
+        print(f"  [FAIL] {result['key']}: {result['status']}{detail}")
+
+    fixed = sum(1 for r in results if r.get("fixed"))
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"\nAudited {len(results)} objects: {summary}")
+    if fixed:
+        print(f"Re-uploaded and verified {fixed} objects")
+
+    passed = not failures
+    print("AUDIT PASSED" if passed else f"AUDIT FAILED ({len(failures)} objects)")
+    return passed
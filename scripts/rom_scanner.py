@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Concurrent, case-insensitive ROM directory scanner.
+
+Walks each top-level subdirectory of a ROM source (a/, b/, c/...) in its own
+thread using os.scandir, and yields matching DirEntry objects as soon as they
+are found.
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Union
+
+# ROM file extensions per system (keyed by S3 prefix, matched case-insensitively)
+ROM_EXTENSIONS = {
+    "atari2600": (".bin",),
+    "snes": (".smc",),
+}
+
+# Marker a worker puts on the queue when its subdirectory is finished
+_DONE = object()
+
+
+def is_rom_file(name: str, system: str) -> bool:
+    """Check if a filename has one of the system's ROM extensions (any case)."""
+    return name.lower().endswith(ROM_EXTENSIONS[system])
+
+
+def rom_sort_key(name: str, path: str) -> tuple:
+    """
+    Order used to pick a winner among ROMs that sanitize to the same name.
+
+    Compares the name without extension first, so the plain "Adventure.bin"
+    beats variants like "Adventure (Rev 1).bin" or "Adventure [a].bin".
+    """
+    return (os.path.splitext(name)[0].lower(), name.lower(), path)
+
+
+def _sorted_entries(path: str) -> list:
+    """List a directory, sorted case-insensitively like the old sorted glob."""
+    try:
+        with os.scandir(path) as it:
+            return sorted(it, key=lambda e: e.name.lower())
+    except OSError as e:
+        print(f"  [WARN] Cannot scan {path}: {e}")
+        return []
+
+
+def _walk(path: str, system: str, out: queue.Queue, stop: threading.Event):
+    """Recursively scan one directory, pushing matching entries onto the queue."""
+    if stop.is_set():
+        return
+
+    for entry in _sorted_entries(path):
+        if stop.is_set():
+            return
+        if entry.is_dir(follow_symlinks=False):
+            _walk(entry.path, system, out, stop)
+        elif entry.is_file() and is_rom_file(entry.name, system):
+            out.put(entry)
+
+
+def scan_roms(
+    source: Union[str, Path],
+    system: str,
+    recursive: bool = True,
+    max_workers: int = 8,
+) -> Iterator[os.DirEntry]:
+    """
+    Yield ROM files under source for the given system.
+
+    Files directly in source are yielded first, then (if recursive) each
+    top-level subdirectory is walked concurrently. Entries within a
+    subdirectory come out in case-insensitive name order; order across
+    subdirectories depends on which worker finishes first, so use
+    dedupe_roms() when the order matters.
+
+    dedupe_roms() and the upload scripts' priority order both need the full
+    listing, so uploads start once the scan is done - the concurrency here
+    shortens the scan rather than overlapping it with uploads.
+    """
+    subdirs = []
+    for entry in _sorted_entries(str(source)):
+        if entry.is_dir(follow_symlinks=False):
+            subdirs.append(entry.path)
+        elif entry.is_file() and is_rom_file(entry.name, system):
+            yield entry
+
+    if not recursive or not subdirs:
+        return
+
+    out = queue.Queue()
+    stop = threading.Event()
+
+    def worker(path: str):
+        try:
+            _walk(path, system, out, stop)
+        finally:
+            out.put(_DONE)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for path in subdirs:
+            pool.submit(worker, path)
+
+        try:
+            remaining = len(subdirs)
+            while remaining:
+                item = out.get()
+                if item is _DONE:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            # Caller stopped iterating early - let the workers bail out
+            stop.set()
+
+
+def dedupe_roms(
+    entries: Iterable[os.DirEntry],
+    sanitize: Callable[[str], str],
+    quiet: bool = False,
+) -> Dict[str, os.DirEntry]:
+    """
+    Map sanitized filename -> DirEntry, one ROM per sanitized name.
+
+    When several files sanitize to the same name, the one with the smallest
+    rom_sort_key() wins, regardless of scan order.
+    """
+    roms = {}
+    for entry in entries:
+        safe_name = sanitize(entry.name)
+        current = roms.get(safe_name)
+        if current is None:
+            roms[safe_name] = entry
+            continue
+
+        if rom_sort_key(entry.name, entry.path) < rom_sort_key(current.name, current.path):
+            roms[safe_name], entry = entry, current
+        if not quiet:
+            print(f"  [DUP] {entry.name} -> {safe_name} (skipping duplicate)")
+    return roms
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Watch a ROM source directory and upload + catalog new or changed ROMs.
+
+Uses watchdog (inotify on Linux, native APIs elsewhere) when it is
+installed, otherwise falls back to polling with the ROM scanner. Bursts of
+events (e.g. copying a whole folder in) are debounced into a single batch.
+
+    pip install watchdog
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Set, Union
+
+from rom_catalog import load_catalog
+from rom_s3 import check_object, file_fingerprint, upload_rom
+from rom_scanner import is_rom_file, rom_sort_key, scan_roms
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+
+class _Debouncer:
+    """Collects paths and releases them once no new ones arrive for `quiet` seconds."""
+
+    def __init__(self, quiet: float):
+        self.quiet = quiet
+        self.pending = set()
+        self.last_event = 0.0
+        self.cond = threading.Condition()
+
+    def add(self, path: str):
+        with self.cond:
+            self.pending.add(path)
+            self.last_event = time.monotonic()
+            self.cond.notify()
+
+    def next_batch(self) -> Set[str]:
+        """Block until a quiet period follows at least one event."""
+        with self.cond:
+            while True:
+                if not self.pending:
+                    # Timed wait so Ctrl+C is still delivered on Windows
+                    self.cond.wait(1.0)
+                    continue
+                remaining = self.last_event + self.quiet - time.monotonic()
+                if remaining <= 0:
+                    batch, self.pending = self.pending, set()
+                    return batch
+                self.cond.wait(remaining)
+
+
+class _RomEventHandler(FileSystemEventHandler):
+    """Forwards created/modified/moved ROM files to the debouncer."""
+
+    def __init__(self, system: str, debouncer: _Debouncer):
+        super().__init__()
+        self.system = system
+        self.debouncer = debouncer
+
+    def _add(self, path: str):
+        if is_rom_file(os.path.basename(path), self.system):
+            self.debouncer.add(path)
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._add(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._add(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self._add(event.dest_path)
+
+
+def _snapshot(source: Union[str, Path], system: str, recursive: bool) -> dict:
+    """Map path -> (size, mtime) for every ROM under source."""
+    snapshot = {}
+    for entry in scan_roms(source, system, recursive=recursive):
+        st = entry.stat()
+        snapshot[entry.path] = (st.st_size, st.st_mtime_ns)
+    return snapshot
+
+
+def _poll(source, system: str, recursive: bool, debouncer: _Debouncer, interval: float):
+    """Polling fallback: rescan every `interval` seconds and report differences."""
+    previous = None
+    while previous is None:
+        try:
+            previous = _snapshot(source, system, recursive)
+        except Exception as e:
+            print(f"  [WARN] Polling scan failed, retrying: {e}")
+            time.sleep(interval)
+
+    while True:
+        time.sleep(interval)
+        try:
+            current = _snapshot(source, system, recursive)
+        except Exception as e:
+            # Files vanishing mid-scan, source drive briefly unavailable, ...
+            print(f"  [WARN] Polling scan failed, retrying: {e}")
+            continue
+        for path, stat in current.items():
+            if previous.get(path) != stat:
+                debouncer.add(path)
+        previous = current
+
+
+def _retry_later(debouncer: _Debouncer, paths: Set[str], delay: float):
+    """Feed paths back into the debouncer after `delay` seconds."""
+    def requeue():
+        for path in paths:
+            debouncer.add(path)
+
+    timer = threading.Timer(delay, requeue)
+    timer.daemon = True
+    timer.start()
+
+
+def watch_source(
+    source: Union[str, Path],
+    system: str,
+    on_batch: Callable[[Set[str]], Optional[Set[str]]],
+    initial: Iterable[str] = (),
+    recursive: bool = True,
+    debounce: float = 2.0,
+    poll_interval: float = 5.0,
+    retry_delay: float = 30.0,
+    use_polling: bool = False,
+):
+    """
+    Call on_batch(paths) with each debounced batch of new or changed ROMs.
+
+    Files already present when watching starts are not reported, except for
+    the `initial` paths, which go into the first batch. on_batch may return
+    paths that failed; they are queued again after retry_delay seconds (as
+    is the whole batch if on_batch raises). Runs until interrupted with
+    Ctrl+C.
+    """
+    debouncer = _Debouncer(debounce)
+    for path in initial:
+        debouncer.add(path)
+
+    observer = None
+    if Observer is not None and not use_polling:
+        observer = Observer()
+        observer.schedule(_RomEventHandler(system, debouncer), str(source), recursive=recursive)
+        observer.start()
+        print(f"Watching {source} for new ROMs (Ctrl+C to stop)")
+    else:
+        if not use_polling:
+            print("watchdog not installed - falling back to polling")
+        threading.Thread(
+            target=_poll, args=(source, system, recursive, debouncer, poll_interval), daemon=True
+        ).start()
+        print(f"Polling {source} every {poll_interval}s for new ROMs (Ctrl+C to stop)")
+
+    try:
+        while True:
+            batch = debouncer.next_batch()
+            try:
+                failed = on_batch(batch)
+            except Exception as e:
+                print(f"  [ERROR] Failed to ingest batch: {e}")
+                failed = batch
+            if failed:
+                print(f"  Retrying {len(failed)} ROMs in {retry_delay}s")
+                _retry_later(debouncer, failed, retry_delay)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+
+def ingest_batch(
+    paths: Iterable[str],
+    s3,
+    bucket: str,
+    prefix: str,
+    catalog: dict,
+    sources: dict,
+    make_catalog_entry: Callable[[str], dict],
+    write_catalogs: Callable[[list], None],
+) -> Set[str]:
+    """
+    Upload and catalog one batch of new or changed ROM files.
+
+    catalog (filename -> entry) and sources (filename -> local path) are
+    updated in place. Returns the paths that failed and should be retried.
+    """
+    changed = 0
+    failed = set()
+    for path in sorted(paths):
+        # File may have been removed or renamed again before the batch fired
+        if not os.path.isfile(path):
+            continue
+
+        original_name = os.path.basename(path)
+        entry = make_catalog_entry(original_name)
+        safe_name = entry["filename"]
+        s3_key = f"{prefix}/{safe_name}"
+
+        # Same sanitized name as another local ROM - keep upload_roms()'s winner
+        current = sources.get(safe_name)
+        if (
+            current
+            and current != path
+            and os.path.isfile(current)
+            and rom_sort_key(os.path.basename(current), current) < rom_sort_key(original_name, path)
+        ):
+            print(f"  [DUP] {original_name} -> {safe_name} (skipping duplicate)")
+            continue
+
+        try:
+            entry.update(file_fingerprint(path))
+
+            # Spurious modify events (touch, re-copy) shouldn't re-upload
+            status = check_object(s3, bucket, s3_key, entry["size"], entry["md5"])["status"]
+            if status == "ok":
+                print(f"  [SKIP] {safe_name} (unchanged)")
+            else:
+                print(f"  [UPLOAD] {original_name} -> {safe_name}")
+                upload_rom(s3, bucket, s3_key, path, md5=entry["md5"])
+        except Exception as e:
+            print(f"    ERROR: {original_name}: {e}")
+            failed.add(path)
+            continue
+
+        sources[safe_name] = path
+        if catalog.get(safe_name) != entry:
+            catalog[safe_name] = entry
+            changed += 1
+
+    if changed:
+        print(f"{changed} catalog entries added/updated ({len(catalog)} games)")
+        write_catalogs(list(catalog.values()))
+
+    return failed
+
+
+def watch_and_ingest(
+    s3,
+    bucket: str,
+    source: Union[str, Path],
+    system: str,
+    catalog_path: Path,
+    local_sources: dict,
+    make_catalog_entry: Callable[[str], dict],
+    write_catalogs: Callable[[list], None],
+    recursive: bool = True,
+    debounce: float = 2.0,
+    use_polling: bool = False,
+):
+    """
+    Upload and catalog ROMs as they are added under source, until Ctrl+C.
+
+    system doubles as the S3 prefix. local_sources maps catalog filename ->
+    local path (the duplicate winners from a full scan). Local ROMs missing
+    from the catalog at startup - added while nothing was watching - are
+    ingested first. The catalog is loaded once and updated in place, and
+    the catalog files are rewritten after each batch; the TypeScript catalog
+    is bundled at build time, so new games reach the site with the next web
+    build.
+    """
+    catalog = {game["filename"]: game for game in load_catalog(catalog_path)}
+    print(f"Loaded {len(catalog)} games from {catalog_path}")
+
+    missing = [path for filename, path in local_sources.items() if filename not in catalog]
+    if missing:
+        print(f"{len(missing)} local ROMs are not in the catalog yet - ingesting them first")
+
+    def ingest(paths: Set[str]) -> Set[str]:
+        return ingest_batch(
+            paths, s3, bucket, system, catalog, local_sources,
+            make_catalog_entry, write_catalogs,
+        )
+
+    watch_source(
+        source, system, ingest,
+        initial=missing, recursive=recursive, debounce=debounce, use_polling=use_polling,
+    )
@@ -0,0 +1,65 @@
+"""
+Shared fixtures for the ROM upload script tests.
+
+Run from the repo root with:  python -m pytest scripts/tests
+"""
+
+import hashlib
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# The scripts import each other as top-level modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# upload_snes_roms checks credentials at import time; tests never hit a real bucket
+for name in ("RAILWAY_S3_BUCKET", "RAILWAY_S3_ACCESS_KEY", "RAILWAY_S3_SECRET_KEY"):
+    os.environ.setdefault(name, "test")
+
+
+class FakeS3:
+    """In-memory stand-in for the few boto3 S3 calls the scripts make."""
+
+    def __init__(self):
+        self.objects = {}  # key -> (bytes, metadata)
+        self.uploads = []
+        self.lock = threading.Lock()
+
+    def head_object(self, Bucket, Key):
+        from botocore.exceptions import ClientError
+
+        with self.lock:
+            if Key not in self.objects:
+                raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+            data, metadata = self.objects[Key]
+        return {
+            "ContentLength": len(data),
+            "ETag": f'"{hashlib.md5(data).hexdigest()}"',
+            "Metadata": dict(metadata),
+        }
+
+    def upload_file(self, path, bucket, key, ExtraArgs=None):
+        with open(path, "rb") as f:
+            data = f.read()
+        with self.lock:
+            self.objects[key] = (data, dict((ExtraArgs or {}).get("Metadata", {})))
+            self.uploads.append(key)
+
+    def put(self, key, data, metadata=None):
+        """Put an object directly, bypassing upload_file bookkeeping."""
+        self.objects[key] = (data, dict(metadata or {}))
+
+
+@pytest.fixture
+def fake_s3():
+    return FakeS3()
+
+
+def write_rom(path: Path, data: bytes = b"\x00" * 16) -> Path:
+    """Create a ROM file (and its parent directories)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
@@ -0,0 +1,119 @@
+"""Bucket audit: catalog size/MD5 vs. remote objects."""
+
+import hashlib
+
+import pytest
+
+pytest.importorskip("botocore")
+
+from botocore.exceptions import EndpointConnectionError  # noqa: E402
+
+from conftest import write_rom  # noqa: E402
+from rom_s3 import audit_objects, file_fingerprint, print_audit_report, upload_rom  # noqa: E402
+
+
+def catalog_entry(filename, data):
+    return {"filename": filename, "size": len(data), "md5": hashlib.md5(data).hexdigest()}
+
+
+def statuses(results):
+    return {r["key"]: r["status"] for r in results}
+
+
+def test_audit_uses_catalog_fingerprints_without_local_files(fake_s3):
+    good, truncated = b"a" * 100, b"b" * 100
+    fake_s3.put("p/good.bin", good)
+    fake_s3.put("p/truncated.bin", truncated[:50])
+
+    results = audit_objects(
+        fake_s3, "bucket", "p",
+        [catalog_entry("good.bin", good), catalog_entry("truncated.bin", truncated)],
+        local_files={},
+    )
+
+    assert statuses(results) == {"p/good.bin": "ok", "p/truncated.bin": "size-mismatch"}
+    assert print_audit_report(results) is False
+
+
+def test_checksum_mismatch_and_missing(fake_s3):
+    expected = b"c" * 10
+    fake_s3.put("p/corrupt.bin", b"x" * 10)
+
+    results = audit_objects(
+        fake_s3, "bucket", "p",
+        [catalog_entry("corrupt.bin", expected), catalog_entry("gone.bin", expected)],
+        local_files={},
+    )
+
+    assert statuses(results) == {"p/corrupt.bin": "checksum-mismatch", "p/gone.bin": "missing"}
+
+
+def test_unverified_and_size_only_fail_the_audit(fake_s3):
+    data = b"d" * 10
+    fake_s3.put("p/old.bin", data)
+    fake_s3.objects["p/multipart.bin"] = (data, {})
+    real_head = fake_s3.head_object
+
+    def multipart_head(Bucket, Key):
+        head = real_head(Bucket, Key)
+        if Key == "p/multipart.bin":
+            head["ETag"] = '"abc-2"'
+        return head
+
+    fake_s3.head_object = multipart_head
+
+    results = audit_objects(
+        fake_s3, "bucket", "p",
+        [{"filename": "old.bin"}, catalog_entry("multipart.bin", data)],
+        local_files={},
+    )
+
+    assert statuses(results) == {"p/old.bin": "unverified", "p/multipart.bin": "size-only"}
+    assert print_audit_report(results) is False
+
+
+def test_old_catalog_entries_fall_back_to_local_file(fake_s3, tmp_path):
+    rom = write_rom(tmp_path / "old.bin", b"e" * 10)
+    fake_s3.put("p/old.bin", b"e" * 10)
+
+    results = audit_objects(
+        fake_s3, "bucket", "p", [{"filename": "old.bin"}], local_files={"old.bin": str(rom)}
+    )
+
+    assert statuses(results) == {"p/old.bin": "ok"}
+
+
+def test_network_errors_become_failed_rows(fake_s3):
+    data = b"f" * 10
+    fake_s3.put("p/fine.bin", data)
+    real_head = fake_s3.head_object
+
+    def flaky_head(Bucket, Key):
+        if Key == "p/down.bin":
+            raise EndpointConnectionError(endpoint_url="http://s3")
+        return real_head(Bucket, Key)
+
+    fake_s3.head_object = flaky_head
+
+    results = audit_objects(
+        fake_s3, "bucket", "p",
+        [catalog_entry("fine.bin", data), catalog_entry("down.bin", data)],
+        local_files={},
+    )
+
+    assert statuses(results) == {"p/fine.bin": "ok", "p/down.bin": "error"}
+
+
+def test_fix_reuploads_with_md5_metadata(fake_s3, tmp_path):
+    data = b"g" * 10
+    rom = write_rom(tmp_path / "rom.bin", data)
+    fake_s3.put("p/rom.bin", data[:5])
+
+    results = audit_objects(
+        fake_s3, "bucket", "p", [catalog_entry("rom.bin", data)],
+        local_files={"rom.bin": str(rom)},
+        reupload=lambda path, key: upload_rom(fake_s3, "bucket", key, path),
+    )
+
+    assert results[0]["status"] == "ok" and results[0]["fixed"]
+    assert fake_s3.objects["p/rom.bin"][1]["md5"] == file_fingerprint(str(rom))["md5"]
@@ -0,0 +1,56 @@
+"""Case-insensitive scanning and deterministic duplicate resolution."""
+
+import os
+
+from conftest import write_rom
+from rom_scanner import dedupe_roms, rom_sort_key, scan_roms
+
+
+def sanitize(name: str) -> str:
+    """Drop extension and anything in brackets, like the upload scripts do."""
+    stem = os.path.splitext(name)[0]
+    return stem.split(" (")[0].split(" [")[0].lower() + ".bin"
+
+
+def names(entries) -> list:
+    return sorted(entry.name for entry in entries)
+
+
+def test_scan_matches_extensions_case_insensitively(tmp_path):
+    write_rom(tmp_path / "Pitfall.BIN")
+    write_rom(tmp_path / "Adventure.bin")
+    write_rom(tmp_path / "readme.txt")
+
+    assert names(scan_roms(tmp_path, "atari2600")) == ["Adventure.bin", "Pitfall.BIN"]
+
+
+def test_scan_recursive_flag(tmp_path):
+    write_rom(tmp_path / "Top.smc")
+    write_rom(tmp_path / "a" / "Nested.smc")
+    write_rom(tmp_path / "b" / "deeper" / "Deep.SMC")
+
+    assert names(scan_roms(tmp_path, "snes", recursive=False)) == ["Top.smc"]
+    assert names(scan_roms(tmp_path, "snes")) == ["Deep.SMC", "Nested.smc", "Top.smc"]
+
+
+def test_dedupe_prefers_plain_name_over_variants(tmp_path):
+    for name in ["Adventure (Rev 1).bin", "Adventure [a].bin", "Adventure.bin"]:
+        write_rom(tmp_path / name)
+
+    roms = dedupe_roms(scan_roms(tmp_path, "atari2600"), sanitize, quiet=True)
+
+    assert roms["adventure.bin"].name == "Adventure.bin"
+
+
+def test_dedupe_winner_does_not_depend_on_scan_order(tmp_path):
+    for sub in ["a", "b", "c", "d"]:
+        write_rom(tmp_path / sub / "Combat.bin")
+    entries = list(scan_roms(tmp_path, "atari2600"))
+
+    forward = dedupe_roms(entries, sanitize, quiet=True)
+    backward = dedupe_roms(reversed(entries), sanitize, quiet=True)
+
+    assert forward["combat.bin"].path == backward["combat.bin"].path
+    assert forward["combat.bin"].path == min(
+        (e.path for e in entries), key=lambda p: rom_sort_key("Combat.bin", p)
+    )
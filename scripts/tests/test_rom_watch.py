@@ -0,0 +1,96 @@
+"""Debouncing, duplicate handling, retries and startup catch-up in rom_watch."""
+
+import json
+import threading
+
+import pytest
+
+pytest.importorskip("boto3")
+
+import rom_watch  # noqa: E402
+import upload_snes_roms  # noqa: E402
+from conftest import write_rom  # noqa: E402
+
+
+def ingest(paths, fake_s3, catalog, sources, written):
+    return rom_watch.ingest_batch(
+        paths, fake_s3, "bucket", "snes", catalog, sources,
+        upload_snes_roms.make_catalog_entry, written.append,
+    )
+
+
+def test_debouncer_releases_burst_as_one_batch():
+    debouncer = rom_watch._Debouncer(0.05)
+    debouncer.add("a.smc")
+    threading.Timer(0.02, debouncer.add, args=("b.smc",)).start()
+
+    assert debouncer.next_batch() == {"a.smc", "b.smc"}
+
+
+def test_ingest_skips_duplicate_that_loses_to_current_source(tmp_path, fake_s3):
+    plain = write_rom(tmp_path / "Zelda.smc", b"plain")
+    variant = write_rom(tmp_path / "Zelda (Rev 1).smc", b"variant")
+    catalog, sources, written = {}, {"zelda.smc": str(plain)}, []
+
+    failed = ingest({str(variant)}, fake_s3, catalog, sources, written)
+
+    assert failed == set()
+    assert fake_s3.uploads == []
+    assert sources["zelda.smc"] == str(plain)
+    assert written == []
+
+
+def test_ingest_returns_failed_uploads_and_keeps_them_out_of_catalog(tmp_path, fake_s3, monkeypatch):
+    rom = write_rom(tmp_path / "Zelda.smc")
+    catalog, sources, written = {}, {}, []
+
+    def broken_upload(*args, **kwargs):
+        raise ConnectionError("connection reset")
+
+    monkeypatch.setattr(fake_s3, "upload_file", broken_upload)
+    assert ingest({str(rom)}, fake_s3, catalog, sources, written) == {str(rom)}
+    assert catalog == {} and written == []
+
+    monkeypatch.undo()
+    assert ingest({str(rom)}, fake_s3, catalog, sources, written) == set()
+    assert list(catalog) == ["zelda.smc"]
+    assert fake_s3.uploads == ["snes/zelda.smc"]
+
+
+def test_watch_source_retries_failed_paths(tmp_path):
+    batches = []
+
+    def on_batch(paths):
+        batches.append(set(paths))
+        if len(batches) == 1:
+            return set(paths)
+        raise KeyboardInterrupt  # stops the watch
+
+    rom_watch.watch_source(
+        tmp_path, "snes", on_batch, initial=["Zelda.smc"],
+        debounce=0.01, retry_delay=0.05, use_polling=True,
+    )
+
+    assert batches == [{"Zelda.smc"}, {"Zelda.smc"}]
+
+
+def test_watch_ingests_local_roms_missing_from_catalog_at_startup(tmp_path, fake_s3, monkeypatch):
+    catalog_path = tmp_path / "catalog.json"
+    catalog_path.write_text(json.dumps([upload_snes_roms.make_catalog_entry("Zelda.smc")]))
+    zelda = write_rom(tmp_path / "Zelda.smc")
+    chrono = write_rom(tmp_path / "Chrono Trigger.smc")
+    written = []
+
+    def fake_watch_source(source, system, on_batch, initial=(), **kwargs):
+        assert list(initial) == [str(chrono)]
+        on_batch(set(initial))
+
+    monkeypatch.setattr(rom_watch, "watch_source", fake_watch_source)
+    rom_watch.watch_and_ingest(
+        fake_s3, "bucket", tmp_path, "snes", catalog_path,
+        {"zelda.smc": str(zelda), "chrono_trigger.smc": str(chrono)},
+        upload_snes_roms.make_catalog_entry, written.append,
+    )
+
+    assert fake_s3.uploads == ["snes/chrono_trigger.smc"]
+    assert sorted(g["filename"] for g in written[-1]) == ["chrono_trigger.smc", "zelda.smc"]
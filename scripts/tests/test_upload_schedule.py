@@ -0,0 +1,119 @@
+"""Priority ordering and interim catalog checkpoints in upload_roms()."""
+
+import json
+
+import pytest
+
+pytest.importorskip("boto3")
+
+import upload_snes_roms  # noqa: E402
+from conftest import write_rom  # noqa: E402
+from rom_catalog import upload_priority  # noqa: E402
+from rom_s3 import file_fingerprint  # noqa: E402
+
+
+@pytest.fixture
+def snes(tmp_path, fake_s3, monkeypatch):
+    """upload_snes_roms wired to a temp ROM dir, temp catalog and fake S3."""
+    source = tmp_path / "roms"
+    source.mkdir()
+    written = []
+    monkeypatch.setattr(upload_snes_roms, "ROM_SOURCE", source)
+    monkeypatch.setattr(upload_snes_roms, "CATALOG_PATH", tmp_path / "catalog.json")
+    monkeypatch.setattr(upload_snes_roms, "S3_BUCKET", "bucket")
+    monkeypatch.setattr(upload_snes_roms, "create_s3_client", lambda *a, **k: fake_s3)
+    monkeypatch.setattr(
+        upload_snes_roms, "generate_typescript_catalog",
+        lambda catalog: written.append(sorted(g["filename"] for g in catalog)),
+    )
+    upload_snes_roms.written = written
+    return upload_snes_roms
+
+
+def test_upload_priority_orders_favorites_then_genre_then_size():
+    weights = {"platformer": 0, "rpg": 1}
+    fav_rpg = {"favorite": True, "genre": "rpg", "filename": "b"}
+    fav_platformer = {"favorite": True, "genre": "platformer", "filename": "c"}
+    small = {"favorite": False, "genre": "rpg", "filename": "d"}
+    unknown_genre = {"favorite": False, "genre": "mystery", "filename": "a"}
+
+    order = sorted(
+        [(small, 1), (unknown_genre, 1), (fav_rpg, 100), (fav_platformer, 500)],
+        key=lambda item: upload_priority(item[0], item[1], weights),
+    )
+
+    assert [e["filename"] for e, _ in order] == ["c", "b", "d", "a"]
+
+
+def test_favorites_are_uploaded_first(snes, fake_s3):
+    for name in ["Aero Fighters.smc", "Chrono Trigger.smc", "Tetris Attack.smc"]:
+        write_rom(snes.ROM_SOURCE / name)
+
+    snes.upload_roms(checkpoint_every=0)
+
+    assert fake_s3.uploads[0] == "snes/chrono_trigger.smc"
+
+
+def test_interim_catalog_keeps_previously_published_games(snes, fake_s3):
+    snes.CATALOG_PATH.write_text(json.dumps([snes.make_catalog_entry("Old Game.smc")]))
+    for name in ["Chrono Trigger.smc", "Zelda.smc", "Aero Fighters.smc"]:
+        write_rom(snes.ROM_SOURCE / name)
+
+    snes.upload_roms(checkpoint_every=1)
+
+    # First checkpoint already has the old game plus the first upload
+    assert snes.written[0] == ["chrono_trigger.smc", "old_game.smc"]
+    # The final catalog only lists what this run confirmed
+    assert snes.written[-1] == ["aero_fighters.smc", "chrono_trigger.smc", "zelda.smc"]
+
+
+def test_checkpoint_after_failed_upload(snes, fake_s3, monkeypatch):
+    for name in ["Chrono Trigger.smc", "Zelda.smc", "Aero Fighters.smc"]:
+        write_rom(snes.ROM_SOURCE / name)
+    real_upload = fake_s3.upload_file
+
+    def flaky_upload(path, *args, **kwargs):
+        if "Zelda" in path:
+            raise RuntimeError("boom")
+        return real_upload(path, *args, **kwargs)
+
+    monkeypatch.setattr(fake_s3, "upload_file", flaky_upload)
+
+    catalog = snes.upload_roms(checkpoint_every=1)
+
+    assert [g["filename"] for g in catalog] == ["chrono_trigger.smc", "aero_fighters.smc"]
+    # Two interim checkpoints (one per confirmed game) plus the final write
+    assert len(snes.written) == 3
+
+
+def test_rerun_against_full_bucket_writes_no_interim_catalogs(snes, fake_s3):
+    for name in ["Chrono Trigger.smc", "Zelda.smc", "Aero Fighters.smc"]:
+        write_rom(snes.ROM_SOURCE / name)
+    snes.upload_roms(checkpoint_every=0)
+    snes.written.clear()
+
+    snes.upload_roms(checkpoint_every=1)
+
+    # Nothing changed, so only the final catalog is written
+    assert len(snes.written) == 1
+
+
+def test_catalog_records_size_and_md5_for_audit(snes, fake_s3):
+    rom = write_rom(snes.ROM_SOURCE / "Zelda.smc", b"z" * 32)
+
+    snes.upload_roms(checkpoint_every=0)
+
+    [game] = json.loads(snes.CATALOG_PATH.read_text())
+    assert game["size"] == 32
+    assert game["md5"] == fake_s3.objects["snes/zelda.smc"][1]["md5"]
+    assert game["md5"] == file_fingerprint(str(rom))["md5"]
+
+
+def test_rerun_replaces_object_holding_other_bytes(snes, fake_s3):
+    # e.g. a variant that won the duplicate group under the old ordering
+    fake_s3.put("snes/zelda.smc", b"variant bytes")
+    write_rom(snes.ROM_SOURCE / "Zelda.smc", b"plain bytes")
+
+    snes.upload_roms(checkpoint_every=0)
+
+    assert fake_s3.objects["snes/zelda.smc"][0] == b"plain bytes"
@@ -2,14 +2,26 @@
 """
 Upload Atari 2600 ROMs to Railway S3 bucket with URL-safe filenames.
 Also generates a catalog file for the retro-arcade game.
+
+Usage:
+  python upload_atari_roms.py [--checkpoint N]  # write interim catalog every N new games
+  python upload_atari_roms.py --catalog-only    # catalog without uploading
+  python upload_atari_roms.py --audit [--fix]   # verify bucket matches catalog
+  python upload_atari_roms.py --watch [--poll]  # upload new ROMs as they are added
 """
 
 import os
 import re
 import json
-import boto3
 from pathlib import Path
-from botocore.config import Config
+
+from rom_catalog import load_catalog, save_catalog, upload_priority, write_file_atomic
+from rom_s3 import (
+    audit_objects, check_object, create_s3_client, file_fingerprint, print_audit_report,
+    upload_rom,
+)
+from rom_scanner import dedupe_roms, scan_roms
+from rom_watch import watch_and_ingest
 
 # Railway S3 configuration - NEVER COMMIT CREDENTIALS
 # Set these environment variables before running:
@@ -39,6 +51,20 @@ ROM_SOURCE = Path(r"C:\Users\jack\Downloads\Atari ROMS by JACK")
 # S3 prefix for ROMs
 S3_PREFIX = "atari2600"
 
+# Generated JSON catalog (also the source of truth for --audit)
+CATALOG_PATH = Path(__file__).parent / "atari_2600_catalog.json"
+
+# Upload order after favorites - lower weight goes first
+GENRE_WEIGHTS = {
+    "action": 0,
+    "shooter": 1,
+    "platformer": 2,
+    "adventure": 3,
+    "racing": 4,
+    "sports": 5,
+    "puzzle": 6,
+}
+
 
 def sanitize_filename(filename: str) -> str:
     """Convert filename to URL-safe format."""
@@ -171,94 +197,169 @@ def is_favorite(name: str) -> bool:
     return any(fav in name_lower for fav in favorites)
 
 
-def upload_roms():
-    """Upload all Atari 2600 ROMs to S3 and generate catalog."""
+def make_catalog_entry(original_name: str) -> dict:
+    """Build the catalog entry for a ROM file."""
+    safe_name = sanitize_filename(original_name)
+    display_name = get_display_name(original_name)
+    return {
+        "id": f"atari2600-{safe_name.replace('.bin', '').replace('_', '-')}",
+        "displayName": display_name,
+        "filename": safe_name,
+        "genre": categorize_game(display_name),
+        "favorite": is_favorite(display_name),
+    }
+
+
+def write_catalogs(catalog: list):
+    """Save the JSON catalog and regenerate the TypeScript catalog."""
+    save_catalog(CATALOG_PATH, catalog)
+    generate_typescript_catalog(catalog)
+
+
+def upload_roms(checkpoint_every: int = 50):
+    """
+    Upload all Atari 2600 ROMs to S3 and generate catalog.
+
+    ROMs are uploaded in upload_priority() order. Each time checkpoint_every
+    more games have been added to (or changed in) the catalog, an interim
+    catalog is written: the previously published catalog plus every game
+    confirmed in the bucket so far. The TypeScript catalog is bundled at
+    build time, so an interim catalog means the next web build can ship the
+    favorites even if this run is still going - nothing goes live by itself.
+    0 disables checkpoints.
+    """
     check_s3_credentials()
 
-    # Create S3 client
-    s3 = boto3.client(
-        "s3",
-        endpoint_url=S3_ENDPOINT,
-        aws_access_key_id=S3_ACCESS_KEY,
-        aws_secret_access_key=S3_SECRET_KEY,
-        config=Config(signature_version="s3v4"),
-    )
+    s3 = create_s3_client(S3_ENDPOINT, S3_ACCESS_KEY, S3_SECRET_KEY)
+
+    # Files are in a/, b/, c/... subdirs - scanned concurrently
+    roms = dedupe_roms(scan_roms(ROM_SOURCE, S3_PREFIX), sanitize_filename)
+    print(f"Found {len(roms)} unique ROM files")
 
-    # Find all .bin files recursively (files are in a/, b/, c/... subdirs)
-    rom_files = list(ROM_SOURCE.glob("**/*.bin"))
-    # Also check for uppercase .BIN
-    rom_files.extend(ROM_SOURCE.glob("**/*.BIN"))
-    print(f"Found {len(rom_files)} ROM files")
+    pending = []  # (priority, catalog entry, original name, path)
+    for rom_entry in roms.values():
+        entry = make_catalog_entry(rom_entry.name)
+        priority = upload_priority(entry, rom_entry.stat().st_size, GENRE_WEIGHTS)
+        pending.append((priority, entry, rom_entry.name, rom_entry.path))
+
+    pending.sort(key=lambda item: item[0])
+
+    # Games published by earlier runs stay in interim catalogs
+    interim = {game["filename"]: game for game in load_catalog(CATALOG_PATH)}
+    interim_changes = 0  # Catalog additions/changes since the last write
 
     catalog = []
     uploaded = 0
     skipped = 0
-    seen_filenames = set()  # Track duplicates
 
-    for rom_path in sorted(rom_files, key=lambda p: p.name.lower()):
-        original_name = rom_path.name
-        safe_name = sanitize_filename(original_name)
+    for _, entry, original_name, rom_path in pending:
+        safe_name = entry["filename"]
+        s3_key = f"{S3_PREFIX}/{safe_name}"
 
-        # Skip duplicates (same sanitized name)
-        if safe_name in seen_filenames:
-            print(f"  [DUP] {original_name} -> {safe_name} (skipping duplicate)")
+        # Size + MD5 go in the catalog so --audit can verify the bucket later
+        try:
+            entry.update(file_fingerprint(rom_path))
+        except OSError as e:
+            print(f"  [ERROR] {original_name}: {e}")
             continue
-        seen_filenames.add(safe_name)
-
-        display_name = get_display_name(original_name)
-        genre = categorize_game(display_name)
-        favorite = is_favorite(display_name)
 
-        s3_key = f"{S3_PREFIX}/{safe_name}"
+        live = True
 
-        # Check if already exists
-        try:
-            s3.head_object(Bucket=S3_BUCKET, Key=s3_key)
+        # Skip only if the bucket already holds these exact bytes - a changed
+        # duplicate winner or a corrupt object gets replaced
+        status = check_object(s3, S3_BUCKET, s3_key, entry["size"], entry["md5"])["status"]
+        if status == "ok":
             print(f"  [SKIP] {safe_name} (already exists)")
             skipped += 1
-        except:
+        else:
             # Upload the file
-            print(f"  [UPLOAD] {original_name} -> {safe_name}")
+            action = "UPLOAD" if status in ("missing", "error") else "REPLACE"
+            print(f"  [{action}] {original_name} -> {safe_name}")
             try:
-                s3.upload_file(
-                    str(rom_path),
-                    S3_BUCKET,
-                    s3_key,
-                    ExtraArgs={
-                        "ContentType": "application/octet-stream",
-                        "ACL": "public-read",
-                    }
-                )
+                upload_rom(s3, S3_BUCKET, s3_key, rom_path, md5=entry["md5"])
                 uploaded += 1
             except Exception as e:
                 print(f"    ERROR: {e}")
-                continue
-
-        # Add to catalog
-        game_id = f"atari2600-{safe_name.replace('.bin', '').replace('_', '-')}"
-        catalog.append({
-            "id": game_id,
-            "displayName": display_name,
-            "filename": safe_name,
-            "genre": genre,
-            "favorite": favorite,
-        })
+                live = False
+
+        if live:
+            catalog.append(entry)
+            if interim.get(safe_name) != entry:
+                interim[safe_name] = entry
+                interim_changes += 1
+
+        # Write what's in the bucket so far so a build mid-run picks up top titles
+        if checkpoint_every and interim_changes >= checkpoint_every:
+            print(
+                f"  [CHECKPOINT] Interim catalog: {len(catalog)}/{len(pending)} confirmed, "
+                f"{len(interim)} games in catalog"
+            )
+            write_catalogs(list(interim.values()))
+            interim_changes = 0
 
     print(f"\nUpload complete: {uploaded} uploaded, {skipped} skipped")
     print(f"Total unique games in catalog: {len(catalog)}")
 
-    # Save catalog as JSON for reference
-    catalog_path = Path(__file__).parent / "atari_2600_catalog.json"
-    with open(catalog_path, "w") as f:
-        json.dump(catalog, f, indent=2)
-    print(f"Catalog saved to {catalog_path}")
-
-    # Generate TypeScript catalog
-    generate_typescript_catalog(catalog)
+    write_catalogs(catalog)
 
     return catalog
 
 
+def find_local_roms() -> dict:
+    """Map catalog filename -> local ROM path (same duplicate winner as upload)."""
+    roms = dedupe_roms(scan_roms(ROM_SOURCE, S3_PREFIX), sanitize_filename, quiet=True)
+    return {safe_name: rom_entry.path for safe_name, rom_entry in roms.items()}
+
+
+def audit_roms(fix: bool = False, max_workers: int = 32) -> bool:
+    """
+    Verify every catalog entry against the bucket (size + MD5/ETag).
+
+    Objects are checked against the size/MD5 recorded in the catalog at
+    upload, so the ROM source is only needed for older catalog entries and
+    for re-uploads. Entries that can't be verified count as failures. With
+    fix=True, failed objects are re-uploaded from the local source.
+    Returns True if the audit passed.
+    """
+    check_s3_credentials()
+    s3 = create_s3_client(
+        S3_ENDPOINT, S3_ACCESS_KEY, S3_SECRET_KEY, max_pool_connections=max_workers
+    )
+
+    with open(CATALOG_PATH) as f:
+        catalog = json.load(f)
+    local_files = find_local_roms()
+    print(f"Auditing {len(catalog)} Atari 2600 catalog entries ({len(local_files)} local ROMs)")
+
+    reupload = None
+    if fix:
+        def reupload(path: str, key: str):
+            upload_rom(s3, S3_BUCKET, key, path)
+
+    results = audit_objects(
+        s3, S3_BUCKET, S3_PREFIX, catalog, local_files,
+        max_workers=max_workers, reupload=reupload,
+    )
+    return print_audit_report(results)
+
+
+def watch_roms(use_polling: bool = False, debounce: float = 2.0):
+    """
+    Watch ROM_SOURCE and upload + catalog new or changed ROMs as they appear.
+
+    ROMs added while nothing was watching are picked up at startup, and
+    failed uploads are retried (see rom_watch.watch_and_ingest). Catalog
+    files are rewritten for the next web build.
+    """
+    check_s3_credentials()
+    s3 = create_s3_client(S3_ENDPOINT, S3_ACCESS_KEY, S3_SECRET_KEY)
+    watch_and_ingest(
+        s3, S3_BUCKET, ROM_SOURCE, S3_PREFIX, CATALOG_PATH, find_local_roms(),
+        make_catalog_entry, write_catalogs,
+        debounce=debounce, use_polling=use_polling,
+    )
+
+
 def generate_typescript_catalog(catalog: list):
     """Generate TypeScript catalog file."""
 
@@ -327,59 +428,26 @@ export const ATARI_2600_CATALOG: CatalogGame[] = [
     ts_path = Path(__file__).parent.parent / "apps" / "web" / "src" / "games" / "retro-arcade" / "lib" / "atari-2600-catalog.ts"
     ts_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(ts_path, "w") as f:
-        f.write(ts_content)
+    write_file_atomic(ts_path, ts_content)
 
     print(f"TypeScript catalog saved to {ts_path}")
 
 
 def generate_catalog_only():
     """Generate catalog without uploading - for testing."""
-    rom_files = list(ROM_SOURCE.glob("**/*.bin"))
-    rom_files.extend(ROM_SOURCE.glob("**/*.BIN"))
-    print(f"Found {len(rom_files)} ROM files")
-
-    catalog = []
-    seen_filenames = set()
-
-    for rom_path in sorted(rom_files, key=lambda p: p.name.lower()):
-        original_name = rom_path.name
-        safe_name = sanitize_filename(original_name)
-
-        if safe_name in seen_filenames:
-            continue
-        seen_filenames.add(safe_name)
-
-        display_name = get_display_name(original_name)
-        genre = categorize_game(display_name)
-        favorite = is_favorite(display_name)
-
-        game_id = f"atari2600-{safe_name.replace('.bin', '').replace('_', '-')}"
-        catalog.append({
-            "id": game_id,
-            "displayName": display_name,
-            "filename": safe_name,
-            "genre": genre,
-            "favorite": favorite,
-        })
+    roms = dedupe_roms(scan_roms(ROM_SOURCE, S3_PREFIX), sanitize_filename, quiet=True)
+    catalog = [
+        {**make_catalog_entry(rom_entry.name), **file_fingerprint(rom_entry.path)}
+        for rom_entry in roms.values()
+    ]
 
     print(f"Total unique games: {len(catalog)}")
 
-    # Save catalog as JSON
-    catalog_path = Path(__file__).parent / "atari_2600_catalog.json"
-    with open(catalog_path, "w") as f:
-        json.dump(catalog, f, indent=2)
-    print(f"Catalog saved to {catalog_path}")
-
-    # Generate TypeScript
-    generate_typescript_catalog(catalog)
+    write_catalogs(catalog)
 
     return catalog
 
 
 if __name__ == "__main__":
-    import sys
-    if "--catalog-only" in sys.argv:
-        generate_catalog_only()
-    else:
-        upload_roms()
+    import rom_cli
+    rom_cli.run(upload_roms, audit_roms, watch_roms, generate_catalog_only)